@@ -0,0 +1,258 @@
+"""
+CliCare - Shared plumbing for the test3_* harnesses
+
+HTTP client, rate limiting, auth, caching and output helpers used by
+test3_chatbot.py and test3_privacy.py so optimizations land in one place.
+"""
+
+import aiohttp
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+API_BASE = "http://localhost:5000"
+
+MAX_REQUESTS_PER_MINUTE = 10
+RETRY_ATTEMPTS = 3
+REQUEST_TIMEOUT = 45
+EXPONENTIAL_BACKOFF_BASE = 30
+MAX_BACKOFF = 300
+
+TEST_ADMIN = {
+    "healthadminid": "ADMIN001",
+    "password": "admin123"
+}
+
+# ============================================================================
+# JSON (C-accelerated when orjson is available)
+# ============================================================================
+
+if orjson is not None:
+    def json_dumps(obj):
+        return orjson.dumps(obj)
+
+    def json_dumps_sorted(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def json_loads(data):
+        return orjson.loads(data)
+else:
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+    def json_dumps_sorted(obj):
+        return json.dumps(obj, sort_keys=True).encode()
+
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2).encode()
+
+    def json_loads(data):
+        return json.loads(data)
+
+# ============================================================================
+# OUTPUT HELPERS
+# ============================================================================
+
+def create_output_dir(output_dir):
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    print(f"📁 Output directory: {output_dir}")
+
+def print_header(title):
+    print("\n" + "="*80)
+    print(title.center(80))
+    print("="*80 + "\n")
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+def cache_key(endpoint, data):
+    body = data if isinstance(data, bytes) else json_dumps_sorted(data)
+    return hashlib.sha256(endpoint.encode() + body).hexdigest()
+
+def cache_get(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return json_loads(f.read())
+    return None
+
+def cache_put(cache_dir, key, response):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, f"{key}.json"), 'wb') as f:
+        f.write(json_dumps(response))
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class RateState:
+    """Server-reported rate-limit budget, fed back from response headers"""
+
+    def __init__(self):
+        self.next_available = 0.0  # time.monotonic() timestamp
+
+    def update_from_headers(self, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.isdigit() and int(remaining) == 0:
+            reset = headers.get('X-RateLimit-Reset', '60')
+            try:
+                reset_in = float(reset)
+            except ValueError:
+                reset_in = 60.0
+            if reset_in > 1e6:  # epoch timestamp rather than a delta
+                reset_in = max(0.0, reset_in - time.time())
+            self.next_available = max(self.next_available, time.monotonic() + reset_in)
+
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                self.next_available = max(self.next_available, time.monotonic() + float(retry_after))
+            except ValueError:
+                pass
+
+    def wait_time(self):
+        return max(0.0, self.next_available - time.monotonic())
+
+rate_state = RateState()
+
+class SlidingWindowLimiter:
+    """O(1) limiter: weighted request count over the previous + current 60s windows
+
+    effective = prev * (1 - elapsed_fraction) + curr, so a burst straddling a
+    window boundary can never exceed the limit in any rolling 60s span.
+    """
+
+    def __init__(self, limit, window=60.0):
+        self.limit = limit
+        self.window = window
+        self.prev_count = 0
+        self.curr_count = 0
+        self.window_start = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            # Server-reported budget wins over the local window estimate
+            server_wait = rate_state.wait_time()
+            if server_wait > 0:
+                await asyncio.sleep(server_wait)
+                continue
+
+            now = time.monotonic()
+            while now >= self.window_start + self.window:
+                self.prev_count = self.curr_count
+                self.curr_count = 0
+                self.window_start += self.window
+
+            elapsed_frac = (now - self.window_start) / self.window
+            effective = self.prev_count * (1 - elapsed_frac) + self.curr_count
+            if effective + 1 <= self.limit:
+                self.curr_count += 1
+                return
+            await asyncio.sleep(self.window / self.limit)
+
+rate_limiter = SlidingWindowLimiter(limit=MAX_REQUESTS_PER_MINUTE)
+
+# ============================================================================
+# HTTP CLIENT
+# ============================================================================
+
+def create_session():
+    """One long-lived session shared by every request (keep-alive, pooled DNS)"""
+    connector = aiohttp.TCPConnector(limit=MAX_REQUESTS_PER_MINUTE, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    # Large read buffer: multi-kB AI responses shouldn't stall on the 64KB default
+    return aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                 read_bufsize=4 * 1024 * 1024)
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+async def make_request(session, endpoint, method="GET", data=None, headers=None,
+                       json_body=None):
+    """json_body: pre-encoded JSON bytes; skips re-serializing `data` per call"""
+    url = f"{API_BASE}/{endpoint}"
+    if method == "POST" and json_body is None:
+        json_body = json_dumps(data)
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        try:
+            if method == "GET":
+                response = await session.get(url, headers=headers)
+            elif method == "POST":
+                if headers:
+                    post_headers = dict(headers)
+                    post_headers['Content-Type'] = 'application/json'
+                else:
+                    post_headers = _JSON_HEADERS
+                response = await session.post(url, data=json_body, headers=post_headers)
+
+            async with response:
+                rate_state.update_from_headers(response.headers)
+
+                if response.status == 429:
+                    if attempt < RETRY_ATTEMPTS:
+                        # Full jitter: decorrelates retries so they don't re-fire in lockstep
+                        wait_time = random.uniform(0, min(MAX_BACKOFF, EXPONENTIAL_BACKOFF_BASE * (2 ** attempt)))
+                        # Retry-After may also be an HTTP-date; ignore forms we can't parse
+                        try:
+                            wait_time = max(wait_time, float(response.headers.get('Retry-After', 0)))
+                        except ValueError:
+                            pass
+                        print(f"\n🚨 Rate limit! Waiting {wait_time:.1f}s")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    return None
+
+                if response.status == 504:
+                    if attempt < RETRY_ATTEMPTS:
+                        wait_time = random.uniform(0, min(MAX_BACKOFF, 5 * (2 ** attempt)))
+                        print(f"\n⏰ Timeout! Retry {attempt + 1}/{RETRY_ATTEMPTS} in {wait_time:.1f}s")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    return None
+
+                if response.status in [200, 201]:
+                    return json_loads(await response.read())
+                else:
+                    print(f"\n⚠️  API Error: {response.status}")
+                    return None
+
+        except asyncio.TimeoutError:
+            if attempt < RETRY_ATTEMPTS:
+                print(f"\n⏰ Timeout! Retry {attempt + 1}/{RETRY_ATTEMPTS}")
+                await asyncio.sleep(5)
+                continue
+            print(f"\n❌ Timeout after {RETRY_ATTEMPTS} attempts")
+            return None
+        except Exception as e:
+            print(f"\n⚠️  Error: {e}")
+            return None
+    return None
+
+async def authenticate(session):
+    print("🔐 Authenticating...")
+    result = await make_request(session, "api/admin/login", method="POST", data=TEST_ADMIN)
+    if result and result.get('success'):
+        print(f"✅ Authenticated as: {result.get('admin', {}).get('name')}")
+        token = result.get('token')
+        # Default header on the session: callers no longer build a fresh
+        # headers dict per request
+        session.headers['Authorization'] = f"Bearer {token}"
+        return token
+    print("❌ Authentication failed")
+    return None